@@ -1,11 +1,23 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
+import matplotlib
+matplotlib.use("Agg")
 import matplotlib.pyplot as plt
 import matplotlib.ticker as ticker
 from matplotlib.backends.backend_pdf import PdfPages
+from matplotlib.figure import Figure
 from datetime import date
 import io
+# numba is optional; it only compiles the scalar sweep when that is selected
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+# Set to True to run the P-M sweep through the scalar _sweep in
+# scalar_sweep() instead of the vectorized NumPy path
+USE_SCALAR_SWEEP = False
 
 #%% Units
 inch = 1
@@ -74,197 +86,248 @@ crush_strain = -0.003
 gamma_conc = 0.135
 Ec = 120000 * ((gamma_conc) ** 2) * (fc / ksi) ** 0.33
 
-#%% Max Pn
-
-area_shaft = diameter**2*np.pi/4
-area_steel = area_bar*number_of_bars
-area_conc_total = area_shaft-area_steel
-
-Max_Pn = 0.75*trans_bar_coeff*(area_conc_total*0.85*fc+area_steel*fy)
-
 #%% Functions
-def angle(c):
-    if c > diameter / 0.85:
-        return np.pi
-    else:
-        return np.arccos((radius - c * 0.85) / radius)
-
-def circle_sector(c, theta):
-    if theta < 2 * np.pi:
-        area = ((radius ** 2) / 2) * (theta * 2 - np.sin(2 * theta))
-    else:
-        area = diameter ** 2 * np.pi / 4
-    cg = (4 * radius * np.sin(theta) ** 3) / (3 * (theta * 2 - np.sin(theta * 2)))
+def circle_sector(theta, radius):
+    # theta never exceeds pi, so the sector never wraps to the full circle
+    denom = 2.0 * theta - np.sin(2.0 * theta)
+    area = 0.5 * radius * radius * denom
+    cg = (4.0 * radius * np.sin(theta) ** 3) / (3.0 * denom)
     return area, cg
 
 def resist_factor(strain):
-    if strain <= 0.002:
-        return 0.75
-    elif strain < 0.005:
-        return 0.75 + 0.15 * (strain - 0.002) / (0.005 - 0.002)
+    # Linear ramp from 0.75 at 0.002 to 0.9 at 0.005
+    return np.clip(0.75 + 0.15 * (strain - 0.002) / (0.005 - 0.002), 0.75, 0.9)
+
+def steel_stress(strain, fy):
+    return np.copysign(np.minimum(np.abs(strain) * Es, fy), strain)
+
+# Defined and compiled once per server process rather than on every rerun;
+# editing _sweep changes this function's source, which refreshes the cache
+@st.cache_resource
+def scalar_sweep():
+    def _sweep(c_fine, bar_y, area_bar, radius, crush_strain, Es, fy, ys, fc, Max_Pn):
+        # Scalar form of the P-M sweep for material models that do not vectorize.
+        # Edits here only take effect when USE_SCALAR_SWEEP is True.
+        out = np.empty((len(c_fine), 4))
+        for i in range(len(c_fine)):
+            c = c_fine[i]
+            Pn = 0.0
+            Mn = 0.0
+            Asminus = 0.0
+            max_strain = -np.inf
+            for j in range(len(bar_y)):
+                y_bar_top = radius - bar_y[j]
+                bar_strain = crush_strain * (c - y_bar_top) / c
+                if abs(bar_strain) < ys:
+                    bar_stress = abs(bar_strain) * Es
+                else:
+                    bar_stress = fy
+                if bar_strain < 0:
+                    bar_stress = -bar_stress
+                bar_force = bar_stress * area_bar
+                Pn += bar_force
+                Mn += bar_force * bar_y[j]
+                max_strain = max(max_strain, bar_strain)
+                if y_bar_top < 0.85 * c:
+                    Asminus += area_bar
+            theta = np.arccos(min(max((radius - c * 0.85) / radius, -1.0), 1.0))
+            denom = 2.0 * theta - np.sin(2.0 * theta)
+            compression_area = 0.5 * radius * radius * denom
+            concrete_cg = (4.0 * radius * np.sin(theta) ** 3) / (3.0 * denom)
+            concrete_force = -1 * (compression_area - Asminus) * 0.85 * fc
+            Pn += concrete_force
+            Mn += concrete_force * concrete_cg
+            phi = min(max(0.75 + 0.15 * (max_strain - 0.002) / (0.005 - 0.002), 0.75), 0.9)
+            Pr = Pn * phi
+            if abs(Pr) > Max_Pn:
+                Pr = -Max_Pn
+            out[i, 0] = Pn
+            out[i, 1] = Mn
+            out[i, 2] = Pr
+            out[i, 3] = Mn * phi
+        return out
+
+    return njit(cache=True)(_sweep) if njit is not None else _sweep
+
+@st.cache_data(max_entries=32)
+def compute_pm(diameter, cover, number_of_bars, area_bar, d_bar, trans_d_bar, fc, fy, trans_bar_coeff,
+               use_scalar_sweep):
+    # Cached on the design parameters, so reruns from unrelated widgets skip the sweep
+    radius = diameter / 2
+    ys = fy / Es
+
+    # Max Pn
+    area_shaft = diameter**2*np.pi/4
+    area_steel = area_bar*number_of_bars
+    area_conc_total = area_shaft-area_steel
+
+    Max_Pn = 0.75*trans_bar_coeff*(area_conc_total*0.85*fc+area_steel*fy)
+
+    # Rebar Layout
+    steel_cg = radius - cover - trans_d_bar - d_bar / 2
+    # One vectorized trig call per axis for all bar angles
+    theta_bars = np.deg2rad(np.arange(number_of_bars) * (360.0 / number_of_bars))
+    bar_x = steel_cg * np.cos(theta_bars)
+    bar_y = steel_cg * np.sin(theta_bars)
+
+    # P-M Curve Calculation
+    c_fine = np.linspace(2.0, 99.9, 980)
+    if use_scalar_sweep:
+        P_M_Curve = scalar_sweep()(c_fine, bar_y, area_bar, radius, crush_strain, Es, fy, ys, fc, Max_Pn)
     else:
-        return 0.9
-
-def steel_stress(strain):
-    if abs(strain) < ys:
-        stress = abs(strain) * Es
-    else:
-        stress = fy
-    return stress if strain >= 0 else -stress
+        y_bar_top = radius - bar_y
+
+        # Rows are neutral axis depths, columns are bars
+        C = c_fine[:, None]
+        bar_strain = crush_strain * (C - y_bar_top) / C
+        bar_force = steel_stress(bar_strain, fy) * area_bar
+        bar_moment = bar_force * bar_y
+        Asminus = (y_bar_top < 0.85 * C).sum(axis=1) * area_bar
+        Pn_steel = bar_force.sum(axis=1)
+        Mn_steel = bar_moment.sum(axis=1)
+        max_strain = bar_strain.max(axis=1)
+
+        # Past c = diameter / 0.85 the clip pins the argument to -1, so theta = pi
+        theta = np.arccos(np.clip((radius - c_fine * 0.85) / radius, -1.0, 1.0))
+        compression_area, concrete_cg = circle_sector(theta, radius)
+        concrete_force = -1 * (compression_area - Asminus) * 0.85 * fc
+        concrete_moment = concrete_force * concrete_cg
+
+        # Columns are written in place: Pn, Mn, Pr, Mr
+        P_M_Curve = np.empty((len(c_fine), 4))
+        Pn_arr, Mn_arr, Pr_arr, Mr_arr = P_M_Curve.T
+        np.add(concrete_force, Pn_steel, out=Pn_arr)
+        np.add(concrete_moment, Mn_steel, out=Mn_arr)
+
+        phi = resist_factor(max_strain)
+        np.multiply(Pn_arr, phi, out=Pr_arr)
+        np.multiply(Mn_arr, phi, out=Mr_arr)
+        Pr_arr[np.abs(Pr_arr) > Max_Pn] = -Max_Pn
+
+    # Scale once to kip and kip-in, compression positive
+    P_M_Curve *= -1.0 / kip
+
+    # Bar centroid table for the PDF report
+    bar_coord_list = "\n    ".join([f"Bar {i:2d}: x = {x:.2f} in, y = {y:.2f} in"
+                                    for i, x, y in zip(range(1, number_of_bars + 1), bar_x, bar_y)])
+
+    return {"bar_x": bar_x, "bar_y": bar_y, "P_M_Curve": P_M_Curve, "bar_coord_list": bar_coord_list}
+
+# Figures are built with the Figure API rather than pyplot so they are
+# not tracked (and kept open) by pyplot's figure manager
+def plot_layout(bar_x, bar_y, radius):
+    fig = Figure(figsize=(8.5, 11))
+    ax = fig.subplots()
+    ax.set_aspect('equal')
+    circle = plt.Circle((0, 0), radius, color='gray', fill=False, linewidth=2)
+    ax.add_artist(circle)
+    ax.scatter(bar_x, bar_y, color='purple', zorder=3)
+    for i, (x, y) in enumerate(zip(bar_x, bar_y)):
+        ax.text(x, y + 0.5, str(i + 1), color='black', fontsize=10, ha='center')
+    ax.axhline(0, color='black', linewidth=0.8)
+    ax.axvline(0, color='black', linewidth=0.8)
+    ax.set_xlim(-radius - 2, radius + 2)
+    ax.set_ylim(-radius - 2, radius + 2)
+    ax.set_title('Rebar Layout in Circular Shaft')
+    ax.set_xlabel('X (in)')
+    ax.set_ylabel('Y (in)')
+    ax.grid(True)
+    fig.tight_layout()
+    return fig
+
+def plot_pm_curve(Mn_vals, Pn_vals, Mr_vals, Pr_vals, points, title, xlabel, x_tick):
+    # points is a tuple of (label, M, P) already in the plotted units
+    # Curves are rasterized so the PDF page stores an image rather than ~1000 path segments
+    fig = Figure(figsize=(8.5, 11), dpi=150)
+    ax = fig.subplots()
+    ax.plot(Mn_vals, Pn_vals, label='Nominal (Pn-Mn)', color='blue', linewidth=2, rasterized=True)
+    ax.plot(Mr_vals, Pr_vals, label='Factored (Pr-Mr)', color='red', linestyle='--', linewidth=2,
+            rasterized=True)
+    for label, M, P in points:
+        ax.plot(M, P, 'ko', markersize=8)
+        ax.axhline(y=P, color='black', linestyle=':', linewidth=1)
+        ax.axvline(x=M, color='black', linestyle=':', linewidth=1)
+        ax.text(M, P, f' {label}', fontsize=9, verticalalignment='bottom')
+
+    ax.set_title(title)
+    ax.set_xlabel(xlabel)
+    ax.set_ylabel('Axial Load (kip)')
+    ax.grid(True, which='both', linestyle='--', linewidth=0.5)
+    ax.axhline(y=0, color='black', linewidth=1)
+    ax.axvline(x=0, color='black', linewidth=1)
+    ax.legend()
+    # Add major and minor grid
+    ax.grid(True, which='major', linestyle='--', linewidth=0.75)
+    ax.minorticks_on()
+    ax.grid(which='minor', linestyle=':', linewidth=0.5)
+
+    # Major ticks every x_tick units on x, 250 on y
+    ax.xaxis.set_major_locator(ticker.MultipleLocator(x_tick))
+    ax.yaxis.set_major_locator(ticker.MultipleLocator(250))
+
+    # Add zero lines for x=0 and y=0
+    ax.axhline(y=0, color='black', linewidth=1.5)
+    ax.axvline(x=0, color='black', linewidth=0.2)
+
+    # Legend, formatting
+    ax.legend()
+    ax.tick_params(which='major', length=6, width=1)
+    ax.tick_params(which='minor', length=3, width=0.5)
+
+    ax.axis('tight')
+    fig.tight_layout()
+    return fig
+
+def fig_to_png(fig):
+    # Same savefig options st.pyplot uses
+    buf = io.BytesIO()
+    fig.savefig(buf, format="png", bbox_inches="tight", dpi=200)
+    return buf.getvalue()
+
+# The rendered PNG bytes are cached, not the Figure: matplotlib is not
+# thread-safe, so a cached Figure must never be shared between sessions
+@st.cache_data(max_entries=32)
+def layout_png(bar_x, bar_y, radius):
+    return fig_to_png(plot_layout(bar_x, bar_y, radius))
+
+@st.cache_data(max_entries=32)
+def pm_curve_png(Mn_vals, Pn_vals, Mr_vals, Pr_vals, points, title, xlabel, x_tick):
+    return fig_to_png(plot_pm_curve(Mn_vals, Pn_vals, Mr_vals, Pr_vals, points, title, xlabel, x_tick))
 
 #%% Rebar Layout
-angle_space = 360 / number_of_bars
-steel_cg = radius - cover - trans_d_bar - d_bar / 2
-bar_coords = {
-    barid: (steel_cg * np.cos(np.deg2rad(barid * angle_space)),
-            steel_cg * np.sin(np.deg2rad(barid * angle_space)))
-    for barid in range(number_of_bars)
-}
+pm = compute_pm(diameter, cover, number_of_bars, area_bar, d_bar, trans_d_bar, fc, fy, trans_bar_coeff,
+                USE_SCALAR_SWEEP)
+bar_x = pm["bar_x"]
+bar_y = pm["bar_y"]
 
-fig1, ax = plt.subplots(figsize=(8.5, 11))
-ax.set_aspect('equal')
-circle = plt.Circle((0, 0), radius, color='gray', fill=False, linewidth=2)
-ax.add_artist(circle)
-for i, (x, y) in bar_coords.items():
-    ax.plot(x, y, 'o', color='purple')
-    ax.text(x, y + 0.5, str(i + 1), color='black', fontsize=10, ha='center')
-ax.axhline(0, color='black', linewidth=0.8)
-ax.axvline(0, color='black', linewidth=0.8)
-ax.set_xlim(-radius - 2, radius + 2)
-ax.set_ylim(-radius - 2, radius + 2)
-ax.set_title('Rebar Layout in Circular Shaft')
-ax.set_xlabel('X (in)')
-ax.set_ylabel('Y (in)')
-ax.grid(True)
-plt.tight_layout()
-st.pyplot(fig1)
+st.image(layout_png(bar_x, bar_y, radius), width="stretch")
 
 #%% P-M Curve Calculation
-c_fine = np.arange(2, 100, 0.1)
-P_M_Curve = []
-for c in c_fine:
-    bar_cg_force_moment = []
-    Asminus = 0
-    for barid, (x, y) in bar_coords.items():
-        dist_geo_cg = y
-        y_bar_top = radius - dist_geo_cg
-        if y_bar_top <= c:
-            bar_strain = crush_strain * (c - y_bar_top) / c
-        else:
-            bar_strain = -crush_strain * (y_bar_top - c) / c
-        bar_stress = steel_stress(bar_strain)
-        bar_force = bar_stress * area_bar
-        bar_moment = bar_force * dist_geo_cg
-        bar_cg_force_moment.append((bar_strain, bar_force, bar_moment))
-        if y_bar_top < 0.85*c:
-            Asminus += area_bar
-    bar_cg_force_moment = np.array(bar_cg_force_moment)
-    theta = angle(c)
-    compression_area, concrete_cg = circle_sector(c, theta)
-    concrete_force = -1 * (compression_area - Asminus) * 0.85 * fc
-    concrete_moment = concrete_force * concrete_cg
-    Pn = concrete_force + sum(bar_cg_force_moment[:, 1])
-    Mn = concrete_moment + sum(bar_cg_force_moment[:, 2])
-    phi = resist_factor(max(bar_cg_force_moment[:, 0]))
-    Pr = Pn * phi
-    if abs(Pr) > Max_Pn:
-        Pr = -Max_Pn
-    Mr = Mn * phi
-    P_M_Curve.append((Pn, Mn, Pr, Mr))
-
-P_M_Curve = np.array(P_M_Curve)
-Pn_vals = -P_M_Curve[:, 0] / kip
-Mn_vals = -P_M_Curve[:, 1] / (kip * ft)
-Pr_vals = -P_M_Curve[:, 2] / kip
-Mr_vals = -P_M_Curve[:, 3] / (kip * ft)
-
-fig2 = plt.figure(figsize=(8.5, 11))
-plt.plot(Mn_vals, Pn_vals, label='Nominal (Pn-Mn)', color='blue', linewidth=2)
-plt.plot(Mr_vals, Pr_vals, label='Factored (Pr-Mr)', color='red', linestyle='--', linewidth=2)
+P_M_Curve = pm["P_M_Curve"]
+Pn_vals = P_M_Curve[:, 0]
+Pr_vals = P_M_Curve[:, 2]
+Mn_vals_in = P_M_Curve[:, 1]  # kip-in
+Mr_vals_in = P_M_Curve[:, 3]  # kip-in
+Mn_vals = Mn_vals_in / ft
+Mr_vals = Mr_vals_in / ft
+
 if plot_user_points and user_points:
-    for pt in user_points:
-        plt.plot(pt["M"], pt["P"], 'ko', markersize=8)
-        plt.axhline(y=pt["P"], color='black', linestyle=':', linewidth=1)
-        plt.axvline(x=pt["M"], color='black', linestyle=':', linewidth=1)
-        plt.text(pt["M"], pt["P"], f' {pt["title"]}', fontsize=9, verticalalignment='bottom')
-
-plt.title('P-M Interaction Curve for Circular Concrete Column')
-plt.xlabel('Moment (kip-ft)')
-plt.ylabel('Axial Load (kip)')
-plt.grid(True, which='both', linestyle='--', linewidth=0.5)
-plt.axhline(y=0, color='black', linewidth=1)
-plt.axvline(x=0, color='black', linewidth=1)
-plt.legend()
-# Add major and minor grid
-plt.grid(True, which='major', linestyle='--', linewidth=0.75)
-plt.minorticks_on()
-plt.grid(which='minor', linestyle=':', linewidth=0.5)
-
-# Ticks every 250 units
-plt.gca().xaxis.set_major_locator(ticker.MultipleLocator(250),)
-plt.gca().yaxis.set_major_locator(ticker.MultipleLocator(250))
-
-# Add zero lines for x=0 and y=0
-plt.axhline(y=0, color='black', linewidth=1.5)
-plt.axvline(x=0, color='black', linewidth=0.2)
-
-# Legend, formatting
-plt.legend()
-plt.tick_params(which='major', length=6, width=1)
-plt.tick_params(which='minor', length=3, width=0.5)
-
-plt.axis('tight')
-# Add tick limiter to avoid warning
-ax = plt.gca()
-plt.tight_layout()
-st.pyplot(fig2)
+    points = tuple((pt["title"], pt["M"], pt["P"]) for pt in user_points)
+else:
+    points = ()
+
+fig2_args = (Mn_vals, Pn_vals, Mr_vals, Pr_vals, points,
+             'P-M Interaction Curve for Circular Concrete Column', 'Moment (kip-ft)', 250)
+st.image(pm_curve_png(*fig2_args), width="stretch")
 
 
 #%% Additional Graph with Moment in kip-in
-Mn_vals_in = -P_M_Curve[:, 1] / kip  # kip-in
-Mr_vals_in = -P_M_Curve[:, 3] / kip  # kip-in
 user_M_in = user_M * ft if user_M else None
+points_in = tuple((label, M * ft, P) for label, M, P in points)
 
-fig3 = plt.figure(figsize=(8.5, 11))
-plt.plot(Mn_vals_in, Pn_vals, label='Nominal (Pn-Mn)', color='blue', linewidth=2)
-plt.plot(Mr_vals_in, Pr_vals, label='Factored (Pr-Mr)', color='red', linestyle='--', linewidth=2)
-if plot_user_points and user_points:
-    for pt in user_points:
-        M_in = pt["M"] * ft
-        plt.plot(M_in, pt["P"], 'ko', markersize=8)
-        plt.axhline(y=pt["P"], color='black', linestyle=':', linewidth=1)
-        plt.axvline(x=M_in, color='black', linestyle=':', linewidth=1)
-        plt.text(M_in, pt["P"], f' {pt["title"]}', fontsize=9, verticalalignment='bottom')
-plt.title('P-M Interaction Curve (Moment in kip-in)')
-plt.xlabel('Moment (kip-in)')
-plt.ylabel('Axial Load (kip)')
-plt.grid(True, which='both', linestyle='--', linewidth=0.5)
-plt.axhline(y=0, color='black', linewidth=1)
-plt.axvline(x=0, color='black', linewidth=1)
-plt.legend()
-# Add major and minor grid
-plt.grid(True, which='major', linestyle='--', linewidth=0.75)
-plt.minorticks_on()
-plt.grid(which='minor', linestyle=':', linewidth=0.5)
-
-# Ticks every 250 units
-plt.gca().xaxis.set_major_locator(ticker.MultipleLocator(2000),)
-plt.gca().yaxis.set_major_locator(ticker.MultipleLocator(250))
-
-# Add zero lines for x=0 and y=0
-plt.axhline(y=0, color='black', linewidth=1.5)
-plt.axvline(x=0, color='black', linewidth=0.2)
-
-# Legend, formatting
-plt.legend()
-plt.tick_params(which='major', length=6, width=1)
-plt.tick_params(which='minor', length=3, width=0.5)
-
-plt.axis('tight')
-# Add tick limiter to avoid warning
-ax = plt.gca()
-plt.tight_layout()
-st.pyplot(fig3)
+fig3_args = (Mn_vals_in, Pn_vals, Mr_vals_in, Pr_vals, points_in,
+             'P-M Interaction Curve (Moment in kip-in)', 'Moment (kip-in)', 2000)
+st.image(pm_curve_png(*fig3_args), width="stretch")
 
 
 
@@ -343,57 +406,11 @@ ITH
 Full code is free to use and expand: https://github.com/OpenSourcePT/PMCurve
 """, unsafe_allow_html=True)
 #%% PDF Export
-if export_pdf:
-    pdf_buffer = io.BytesIO()
-    with PdfPages(pdf_buffer) as pdf:
-        # Title Page
-        fig_title, ax = plt.subplots(figsize=(8.5, 11))
-        ax.axis("off")
-        today = date.today().strftime("%B %d, %Y")
-        ax.text(0.5, 0.75, "P-M Interaction Curve", fontsize=24, ha="center")
-        ax.text(0.5, 0.65, "Circular Concrete Drilled Shaft or Column", fontsize=18, ha="center")
-        ax.text(0.5, 0.55, "AASHTO LRFD 9th Edition-Based Design  ", fontsize=14, ha="center")
-        if project_name:
-            ax.text(0.5, 0.45, f"Project: {project_name}", fontsize=12, ha="center")
-        ax.text(0.5, 0.35, f"Designer: {designer_name}", fontsize=12, ha="center")
-        ax.text(0.5, 0.25, f"Date: {today}", fontsize=12, ha="center")
-        pdf.savefig(fig_title)
-        plt.close(fig_title)
-
-        # Parameters Page
-        fig_params, ax = plt.subplots(figsize=(8.5, 11))
-        ax.axis("off")
-        bar_coord_list = "\n    ".join([f"Bar {i+1:2d}: x = {x:.2f} in, y = {y:.2f} in" for i, (x, y) in bar_coords.items()])
-        param_text = f"""
-Design Parameters Summary
-
-• Column Diameter         : {diameter:.1f} in
-• Concrete Cover          : {cover:.1f} in
-• Number of Bars          : {number_of_bars}
-• Bar Size (ASTM)         : #{bar}
-• Bar Diameter            : {d_bar:.3f} in
-• Bar Area                : {area_bar:.3f} in²
-• Total Steel Area (As)   : {area_bar * number_of_bars:.3f} in²
-
-Material Properties
-
-• Steel Yield Strength (fy)   : {fy / ksi:.1f} ksi
-• Steel Youngs Modulus (Es)   : {Es / ksi:.1f} ksi
-• Steel Yield Strain (εy)     : {ys:.6f}
-• Concrete Strength (f'c)     : {fc / ksi:.1f} ksi
-• Concrete Crushing Strain    : 0.003
-
-Steel Bar Centroids (in):
-    {bar_coord_list}
-"""
-        ax.text(0.01, 0.95, param_text, fontsize=11, va='top', ha='left', family='monospace')
-        pdf.savefig(fig_params)
-        plt.close(fig_params)
-
-        # Assumptions & Guidance Page
-        fig_notes, ax = plt.subplots(figsize=(8.5, 11))
-        ax.axis("off")
-        notes_text = """
+def plot_notes_page():
+    fig_notes = Figure(figsize=(8.5, 11))
+    ax = fig_notes.subplots()
+    ax.axis("off")
+    notes_text = """
 ASSUMPTIONS
 
 General:
@@ -420,23 +437,92 @@ Limitations:
   for the pure axial compression case. The effects 
   of confinement are expressed through the Beta factor
 """
-        ax.text(0.01, 0.95, notes_text, fontsize=11, va='top', ha='left', family='monospace')
-        pdf.savefig(fig_notes)
-        plt.close(fig_notes)
+    ax.text(0.01, 0.95, notes_text, fontsize=11, va='top', ha='left', family='monospace')
+    return fig_notes
+
+def render_param_text(diameter, cover, number_of_bars, bar, d_bar, area_bar, fy, fc, bar_coord_list):
+    ys = fy / Es
+    return f"""
+Design Parameters Summary
+
+• Column Diameter         : {diameter:.1f} in
+• Concrete Cover          : {cover:.1f} in
+• Number of Bars          : {number_of_bars}
+• Bar Size (ASTM)         : #{bar}
+• Bar Diameter            : {d_bar:.3f} in
+• Bar Area                : {area_bar:.3f} in²
+• Total Steel Area (As)   : {area_bar * number_of_bars:.3f} in²
+
+Material Properties
+
+• Steel Yield Strength (fy)   : {fy / ksi:.1f} ksi
+• Steel Youngs Modulus (Es)   : {Es / ksi:.1f} ksi
+• Steel Yield Strain (εy)     : {ys:.6f}
+• Concrete Strength (f'c)     : {fc / ksi:.1f} ksi
+• Concrete Crushing Strain    : 0.003
+
+Steel Bar Centroids (in):
+    {bar_coord_list}
+"""
+
+# Every figure is built inside the call, so no Figure is shared with
+# another session; the cached result is just the PDF bytes
+@st.cache_data(max_entries=8)
+def build_pdf(project_name, designer_name, today, param_text, bar_x, bar_y, radius, fig2_args, fig3_args):
+    pdf_buffer = io.BytesIO()
+    with PdfPages(pdf_buffer) as pdf:
+        # Title Page
+        fig_title = Figure(figsize=(8.5, 11))
+        ax = fig_title.subplots()
+        ax.axis("off")
+        ax.text(0.5, 0.75, "P-M Interaction Curve", fontsize=24, ha="center")
+        ax.text(0.5, 0.65, "Circular Concrete Drilled Shaft or Column", fontsize=18, ha="center")
+        ax.text(0.5, 0.55, "AASHTO LRFD 9th Edition-Based Design  ", fontsize=14, ha="center")
+        if project_name:
+            ax.text(0.5, 0.45, f"Project: {project_name}", fontsize=12, ha="center")
+        ax.text(0.5, 0.35, f"Designer: {designer_name}", fontsize=12, ha="center")
+        ax.text(0.5, 0.25, f"Date: {today}", fontsize=12, ha="center")
+        pdf.savefig(fig_title)
+
+        # Parameters Page
+        fig_params = Figure(figsize=(8.5, 11))
+        ax = fig_params.subplots()
+        ax.axis("off")
+        ax.text(0.01, 0.95, param_text, fontsize=11, va='top', ha='left', family='monospace')
+        pdf.savefig(fig_params)
+
+        # Assumptions & Guidance Page
+        pdf.savefig(plot_notes_page())
 
         # Add plots
-        pdf.savefig(fig1)
-        pdf.savefig(fig2)
-        pdf.savefig(fig3)
-
-    # Move this directly after the export_pdf checkbox section
-    today_str = date.today().strftime("%Y-%m-%d")
-    safe_project_name = project_name.strip().replace(" ", "_") or "UnnamedProject"
-    pdf_filename = f"{safe_project_name}_PM_Curve_{today_str}.pdf"
-
-    st.sidebar.download_button(
-    label="📥 Download PDF Report",
-    data=pdf_buffer.getvalue(),
-    file_name=pdf_filename,
-    mime="application/pdf"
-)
+        pdf.savefig(plot_layout(bar_x, bar_y, radius))
+        pdf.savefig(plot_pm_curve(*fig2_args))
+        pdf.savefig(plot_pm_curve(*fig3_args))
+    return pdf_buffer.getvalue()
+
+if export_pdf:
+    today = date.today().strftime("%B %d, %Y")
+    # A built report stays downloadable until an input it depends on changes
+    pdf_key = (project_name, designer_name, today, diameter, cover, number_of_bars, bar, trans_bar, fc, fy,
+               tie_type, points)
+    if st.sidebar.button("Build PDF"):
+        param_text = render_param_text(diameter, cover, number_of_bars, bar, d_bar, area_bar, fy, fc,
+                                       pm["bar_coord_list"])
+        pdf_bytes = build_pdf(project_name, designer_name, today, param_text, bar_x, bar_y, radius, fig2_args,
+                              fig3_args)
+        st.session_state["pdf_report"] = (pdf_key, pdf_bytes)
+
+    pdf_report = st.session_state.get("pdf_report")
+    if pdf_report is not None and pdf_report[0] == pdf_key:
+        today_str = date.today().strftime("%Y-%m-%d")
+        safe_project_name = project_name.strip().replace(" ", "_") or "UnnamedProject"
+        pdf_filename = f"{safe_project_name}_PM_Curve_{today_str}.pdf"
+
+        # on_click="ignore" keeps the download from triggering a rerun
+        st.sidebar.download_button(
+        label="📥 Download PDF Report",
+        data=pdf_report[1],
+        file_name=pdf_filename,
+        mime="application/pdf",
+        on_click="ignore"
+    )